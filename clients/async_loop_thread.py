@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Long-lived asyncio event loop running in a background thread.
+
+Synchronous code can submit coroutines to a single shared loop instead of
+calling asyncio.run() for each one, so the loop and any resources bound to
+it (such as an aiohttp session) are reused across calls.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class AsyncLoopThread(threading.Thread):
+    """Daemon thread that runs an event loop forever."""
+
+    _instance: Optional["AsyncLoopThread"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__(name="AsyncLoopThread", daemon=True)
+        self.loop = asyncio.new_event_loop()
+        self._loop_ready = threading.Event()
+
+    @classmethod
+    def instance(cls) -> "AsyncLoopThread":
+        """Return the shared loop thread, starting it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None or not cls._instance.is_alive():
+                cls._instance = cls()
+                cls._instance.start()
+                cls._instance._loop_ready.wait()
+            return cls._instance
+
+    def run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._loop_ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the loop and return a future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        """Stop the loop and wait for the thread to exit."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.join()
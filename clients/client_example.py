@@ -83,7 +83,9 @@ async def example_mcp_interaction():
                         "stderr": "",
                         "return_code": 0,
                         "command": "echo 'Hello from MCP client!'",
-                        "working_dir": "/home/brown/ai-sandbox/mcp-sandbox"
+                        "working_dir": "/home/brown/ai-sandbox/mcp-sandbox",
+                        "error": None,
+                        "truncated": False
                     }, indent=2)
                 }
             ]
@@ -121,12 +123,13 @@ async def example_mcp_interaction():
                     "type": "text",
                     "text": json.dumps({
                         "success": False,
-                        "error": "Command blocked for security: Blocked command: rm",
                         "stdout": "",
                         "stderr": "",
                         "return_code": -1,
                         "command": "rm -rf /",
-                        "working_dir": "/home/brown/ai-sandbox/mcp-sandbox"
+                        "working_dir": "/home/brown/ai-sandbox/mcp-sandbox",
+                        "error": "Command blocked for security: Blocked command: rm",
+                        "truncated": False
                     }, indent=2)
                 }
             ]
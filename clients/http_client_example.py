@@ -7,8 +7,27 @@ This demonstrates how to connect to the bash command server via HTTP transport.
 
 import asyncio
 import aiohttp
+import itertools
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+from async_loop_thread import AsyncLoopThread
+
+# orjson is optional; it is much faster than the stdlib json module
+try:
+    import orjson  # type: ignore[import-not-found]
+    
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# Failed connection attempts are retried with exponential backoff
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.05
 
 
 class MCPHTTPClient:
@@ -17,63 +36,159 @@ class MCPHTTPClient:
     def __init__(self, base_url: str = "http://127.0.0.1:8000/mcp"):
         self.base_url = base_url
         self.session_id = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        # JSON-RPC ids must be unique within a session, even for concurrent calls
+        self._request_ids = itertools.count(1)
+    
+    async def __aenter__(self) -> "MCPHTTPClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def _session_get(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                json_serialize=json_dumps
+            )
+        return self._session
+    
+    async def _post(self, payload: Any) -> Any:
+        """POST a JSON-RPC payload and return the decoded response."""
+        session = await self._session_get()
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with session.post(self.base_url, json=payload) as resp:
+                    return json_loads(await resp.read())
+            except aiohttp.ClientConnectorError:
+                # Only connect failures are retried: the request was never sent.
+                # A disconnect after sending may mean a non-idempotent
+                # tools/call (e.g. execute_bash) already ran, so it is raised.
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def initialize(self) -> Dict[str, Any]:
         """Initialize the MCP session."""
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "clientInfo": {
-                        "name": "test-client",
-                        "version": "1.0.0"
-                    }
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._request_ids),
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "tools": {}
+                },
+                "clientInfo": {
+                    "name": "test-client",
+                    "version": "1.0.0"
                 }
             }
-            
-            async with session.post(self.base_url, json=payload) as resp:
-                result = await resp.json()
-                print(f"Initialize response: {result}")
-                return result
+        }
+        
+        result = await self._post(payload)
+        print(f"Initialize response: {result}")
+        return result
     
     async def list_tools(self) -> Dict[str, Any]:
         """List available tools."""
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {}
-            }
-            
-            async with session.post(self.base_url, json=payload) as resp:
-                result = await resp.json()
-                print(f"Tools list: {result}")
-                return result
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._request_ids),
+            "method": "tools/list",
+            "params": {}
+        }
+        
+        result = await self._post(payload)
+        print(f"Tools list: {result}")
+        return result
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a specific tool."""
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "jsonrpc": "2.0", 
-                "id": 3,
+        payload = {
+            "jsonrpc": "2.0", 
+            "id": next(self._request_ids),
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments
+            }
+        }
+        
+        result = await self._post(payload)
+        print(f"Tool call result: {result}")
+        return result
+    
+    async def call_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Call several tools with a single JSON-RPC batch request.
+        
+        Falls back to concurrent individual calls if the server rejects batches
+        or answers with anything other than a list of responses.
+        """
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._request_ids),
                 "method": "tools/call",
                 "params": {
                     "name": tool_name,
                     "arguments": arguments
                 }
             }
-            
-            async with session.post(self.base_url, json=payload) as resp:
-                result = await resp.json()
-                print(f"Tool call result: {result}")
-                return result
+            for tool_name, arguments in calls
+        ]
+        
+        result = await self._post(payload)
+        
+        # A server without batch support answers with a single error object
+        # (e.g. -32600 or, for FastMCP, -32602) instead of a list of responses
+        if not isinstance(result, list):
+            print(f"Batch request rejected ({result}), falling back to concurrent calls")
+            return list(await asyncio.gather(
+                *(self.call_tool(tool_name, arguments) for tool_name, arguments in calls)
+            ))
+        
+        result.sort(key=lambda response: -1 if response.get("id") is None else response["id"])
+        print(f"Batch call results: {result}")
+        return result
+    
+    # Synchronous wrappers. These run on the shared AsyncLoopThread so that
+    # repeated calls reuse one event loop and HTTP session; a client should be
+    # used either through these or from its own event loop, not both.
+    
+    def initialize_sync(self) -> Dict[str, Any]:
+        """Initialize the MCP session from synchronous code."""
+        return AsyncLoopThread.instance().submit(self.initialize()).result()
+    
+    def list_tools_sync(self) -> Dict[str, Any]:
+        """List available tools from synchronous code."""
+        return AsyncLoopThread.instance().submit(self.list_tools()).result()
+    
+    def call_tool_sync(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a specific tool from synchronous code."""
+        return AsyncLoopThread.instance().submit(self.call_tool(tool_name, arguments)).result()
+    
+    def call_batch_sync(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Call several tools in one batch from synchronous code."""
+        return AsyncLoopThread.instance().submit(self.call_batch(calls)).result()
+    
+    def close_sync(self) -> None:
+        """Close the shared HTTP session from synchronous code."""
+        AsyncLoopThread.instance().submit(self.aclose()).result()
 
 
 async def demo_http_client():
@@ -84,47 +199,32 @@ async def demo_http_client():
     print("Connecting to bash command server at http://127.0.0.1:8000/mcp")
     print()
     
-    client = MCPHTTPClient()
-    
     try:
-        # Initialize the connection
-        print("1. Initializing MCP session...")
-        await client.initialize()
-        print()
-        
-        # List available tools
-        print("2. Listing available tools...")
-        await client.list_tools()
-        print()
-        
-        # Get security info
-        print("3. Getting security information...")
-        await client.call_tool("get_security_info", {})
-        print()
-        
-        # List safe commands
-        print("4. Listing safe commands...")
-        await client.call_tool("list_safe_commands", {})
-        print()
-        
-        # Execute a safe command
-        print("5. Executing a safe command...")
-        await client.call_tool("execute_bash", {
-            "command": "echo 'Hello from HTTP MCP client!'"
-        })
-        print()
-        
-        # Test with working directory
-        print("6. Testing with working directory...")
-        await client.call_tool("execute_bash", {
-            "command": "pwd",
-            "working_directory": "/tmp"
-        })
-        print()
-        
+        async with MCPHTTPClient() as client:
+            # Initialize the connection
+            print("1. Initializing MCP session...")
+            await client.initialize()
+            print()
+            
+            # List available tools
+            print("2. Listing available tools...")
+            await client.list_tools()
+            print()
+            
+            # Independent tool calls go out as one batch request, or as
+            # concurrent requests if the server rejects batches (FastMCP does)
+            print("3. Calling tools in a batch (concurrently if batches are unsupported)...")
+            await client.call_batch([
+                ("get_security_info", {}),
+                ("list_safe_commands", {}),
+                ("execute_bash", {"command": "echo 'Hello from HTTP MCP client!'"}),
+                ("execute_bash", {"command": "pwd", "working_directory": "/tmp"}),
+            ])
+            print()
+            
         print("=" * 40)
         print("HTTP client demo completed!")
-        
+            
     except Exception as e:
         print(f"Error: {e}")
         print("Make sure the server is running with:")
@@ -52,17 +52,17 @@ async def demo_server_usage():
         print(f"\n   Executing: {cmd}")
         result = await execute_bash_command(cmd)
         
-        if result["success"]:
-            print(f"   ✓ Success: {result['stdout']}")
+        if result.success:
+            print(f"   ✓ Success: {result.stdout}")
         else:
-            print(f"   ✗ Failed: {result.get('error', 'Unknown error')}")
+            print(f"   ✗ Failed: {result.error or 'Unknown error'}")
     
     # Test security blocking
     print("\n4. Security Blocking Demo:")
     dangerous_cmd = "rm -rf /"
     print(f"   Attempting dangerous command: {dangerous_cmd}")
     result = await execute_bash_command(dangerous_cmd)
-    print(f"   ✓ Blocked: {result.get('error', 'Command was blocked')}")
+    print(f"   ✓ Blocked: {result.error or 'Command was blocked'}")
     
     print("\n" + "=" * 40)
     print("Demo completed successfully!")
@@ -5,7 +5,7 @@ A secure MCP server that allows execution of bash commands with proper
 safety measures and error handling.
 """
 
-from .bash_command_server import mcp, execute_bash_command
+from .bash_command_server import mcp, execute_bash_command, BashResult
 
 __version__ = "1.0.0"
-__all__ = ["mcp", "execute_bash_command"]
\ No newline at end of file
+__all__ = ["mcp", "execute_bash_command", "BashResult"]
\ No newline at end of file
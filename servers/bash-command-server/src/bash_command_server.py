@@ -7,188 +7,451 @@ safety measures and error handling.
 """
 
 import asyncio
+import functools
 import logging
+import re
 import subprocess
 import shlex
-from typing import Any, Dict, List, Optional
+import shutil
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, Generic, List, Optional, ParamSpec, Protocol, TypeVar, cast
 import os
 from pathlib import Path
 
 from fastmcp import FastMCP
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Security configuration
 MAX_COMMAND_LENGTH = 1000
 TIMEOUT_SECONDS = 30
-BLOCKED_COMMANDS = {
+MAX_OUTPUT_BYTES = 1 << 20  # per stream
+EXECUTION_CACHE_TTL_SECONDS = 1.0
+# Immutable so the validation cache stays correct; command names are
+# lowercased here because the first word of a command is compared lowercased
+BLOCKED_COMMANDS: frozenset[str] = frozenset(map(str.lower, (
     'rm', 'rmdir', 'del', 'format', 'fdisk', 'mkfs',
     'dd', 'shutdown', 'reboot', 'halt', 'poweroff',
     'sudo', 'su', 'passwd', 'chown', 'chmod',
     'crontab', 'at', 'batch', 'systemctl', 'service'
-}
-BLOCKED_PATTERNS = [
+)))
+BLOCKED_PATTERNS: tuple[str, ...] = (
     '&&', '||', ';', '|', '>', '>>', '<', '`', '$(',
     'eval', 'exec', 'source', '.', 'wget', 'curl -X'
-]
+)
+SUSPICIOUS_CHARACTERS: tuple[str, ...] = ('$(', '`', '{', '}')
+
+# All blocked patterns and suspicious characters compiled into a single
+# alternation so validation is one scan of the command. Longer patterns come
+# first so the reported match is the most specific one (e.g. '>>' over '>').
+_BLOCKED_RE = re.compile('|'.join(
+    re.escape(pattern)
+    for pattern in sorted(set(BLOCKED_PATTERNS + SUSPICIOUS_CHARACTERS), key=len, reverse=True)
+))
+# First word made only of name characters and followed by whitespace or the
+# end of the command, i.e. one that shell quoting rules leave unchanged.
+# Whitespace matches shlex's own (' \t\r\n') so both agree on the word.
+_PLAIN_FIRST_WORD_RE = re.compile(r'[ \t\r\n]*([\w-]+)(?=[ \t\r\n]|\Z)', re.ASCII)
+
+# Process-wide values used for every command, captured once at import.
+# The server never changes its own working directory.
+_BASE_ENV = {
+    'PATH': os.environ.get('PATH', ''),
+    'HOME': os.environ.get('HOME', ''),
+    'USER': os.environ.get('USER', '')
+}
+_DEFAULT_CWD = os.getcwd()
 
+# Tool responses that never change are built once at import; nested values
+# are tuples so handing out shallow copies cannot leak mutations
+_SAFE_COMMANDS = (
+    "ls -la",
+    "pwd", 
+    "whoami",
+    "date",
+    "echo 'hello world'",
+    "cat /etc/os-release",
+    "ps aux",
+    "df -h",
+    "free -h",
+    "uptime",
+    "which python",
+    "python --version",
+    "uv --version",
+    "git status",
+    "git log --oneline -5"
+)
+_SECURITY_INFO = {
+    "max_command_length": MAX_COMMAND_LENGTH,
+    "timeout_seconds": TIMEOUT_SECONDS,
+    "max_output_bytes": MAX_OUTPUT_BYTES,
+    "blocked_commands": tuple(sorted(BLOCKED_COMMANDS)),
+    "blocked_patterns": BLOCKED_PATTERNS,
+    "environment_variables_available": ("PATH", "HOME", "USER", "PWD"),
+    "security_features": (
+        "Command length validation",
+        "Dangerous command blocking", 
+        "Pattern-based filtering",
+        "Execution timeout",
+        "Output size limit",
+        "Limited environment",
+        "Working directory validation",
+        "Safe character validation"
+    )
+}
+
+@dataclass(slots=True)
+class BashResult:
+    """Outcome of a bash command execution, returned by the execute_bash tool."""
+    success: bool
+    stdout: str = ""
+    stderr: str = ""
+    return_code: int = -1
+    command: str = ""
+    working_dir: str = ""
+    error: Optional[str] = None
+    truncated: bool = False
+
+@functools.lru_cache(maxsize=1024)
 def is_command_safe(command: str) -> tuple[bool, str]:
     """
     Check if a command is safe to execute.
     
+    The result depends only on the command and the module-level security
+    configuration, so it is memoized. Call ``is_command_safe.cache_clear()``
+    after changing that configuration at runtime.
+    
     Returns:
         tuple: (is_safe, reason_if_unsafe)
     """
     if len(command) > MAX_COMMAND_LENGTH:
         return False, f"Command too long (max {MAX_COMMAND_LENGTH} characters)"
     
-    # Check for blocked commands
-    parts = shlex.split(command.lower())
-    if parts and parts[0] in BLOCKED_COMMANDS:
-        return False, f"Blocked command: {parts[0]}"
+    # Check for blocked patterns and suspicious characters
+    match = _BLOCKED_RE.search(command)
+    if match:
+        return False, f"Blocked pattern detected: {match.group(0)}"
     
-    # Check for blocked patterns
-    for pattern in BLOCKED_PATTERNS:
-        if pattern in command:
-            return False, f"Blocked pattern detected: {pattern}"
-    
-    # Check for suspicious characters
-    if any(char in command for char in ['$(', '`', '{', '}']):
-        return False, "Command contains potentially dangerous characters"
+    # Check for blocked commands. A plain first word is read straight off the
+    # command; quoted or escaped ones need shlex to find the real name.
+    plain = _PLAIN_FIRST_WORD_RE.match(command)
+    if plain:
+        first = plain.group(1).lower()
+    else:
+        lexer = shlex.shlex(command, posix=True)
+        lexer.whitespace_split = True
+        lexer.commenters = ''
+        try:
+            first = next(lexer, '').lower()
+        except ValueError as e:
+            return False, f"Unable to parse command: {e}"
+    if first in BLOCKED_COMMANDS:
+        return False, f"Blocked command: {first}"
     
     return True, ""
 
-async def execute_bash_command(command: str, working_dir: Optional[str] = None) -> Dict[str, Any]:
+# Resolved executables; bounded by the programs on PATH. Misses are not
+# cached so commands installed after startup are found.
+_EXECUTABLE_CACHE: Dict[str, str] = {}
+
+def _resolve_executable(name: str) -> Optional[str]:
+    """
+    Resolve a command name to an absolute path using the restricted PATH.
+    
+    Launching an absolute path lets subprocess use posix_spawn (vfork-style)
+    instead of fork + PATH search. Names containing a path separator are
+    returned unchanged so they stay relative to the command's working directory.
+    
+    Returns:
+        The executable path, or None if the command cannot be found
+    """
+    if os.sep in name:
+        return name
+    path = _EXECUTABLE_CACHE.get(name)
+    if path is None:
+        path = shutil.which(name, path=_BASE_ENV['PATH'])
+        if path is not None:
+            _EXECUTABLE_CACHE[name] = path
+    return path
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int) -> tuple[bytes, bool]:
+    """
+    Read a stream until EOF or until more than ``limit`` bytes arrive.
+    
+    Returns:
+        tuple: (data truncated to ``limit`` bytes, whether it was truncated)
+    """
+    chunks = []
+    size = 0
+    while chunk := await stream.read(65536):
+        if size + len(chunk) > limit:
+            chunks.append(chunk[:limit - size])
+            return b''.join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+    return b''.join(chunks), False
+
+async def _collect_output(process: asyncio.subprocess.Process) -> tuple[bytes, bytes, bool]:
+    """
+    Read stdout and stderr concurrently with bounded memory.
+    
+    The process is killed as soon as either stream exceeds MAX_OUTPUT_BYTES.
+    
+    Returns:
+        tuple: (stdout, stderr, truncated)
+    """
+    async def read(stream: asyncio.StreamReader) -> tuple[bytes, bool]:
+        data, truncated = await _read_capped(stream, MAX_OUTPUT_BYTES)
+        if truncated:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        return data, truncated
+    
+    # Both streams exist because the process is always started with PIPE
+    assert process.stdout is not None and process.stderr is not None
+    (stdout, stdout_truncated), (stderr, stderr_truncated) = await asyncio.gather(
+        read(process.stdout), read(process.stderr)
+    )
+    await process.wait()
+    return stdout, stderr, stdout_truncated or stderr_truncated
+
+async def execute_bash_command(
+    command: str,
+    working_dir: Optional[str] = None,
+    use_shell: bool = False
+) -> BashResult:
     """
     Safely execute a bash command with timeout and error handling.
     
+    By default the command is split into arguments and executed directly,
+    without spawning a shell. Validation already rejects shell operators, so
+    the shell is only needed for globbing or variable expansion.
+    
     Args:
         command: The bash command to execute
         working_dir: Optional working directory for command execution
+        use_shell: Run the command through /bin/sh instead of executing it directly
         
     Returns:
-        Dict containing stdout, stderr, return_code, and execution info
+        BashResult containing stdout, stderr, return_code, and execution info
     """
     # Validate command safety
     is_safe, reason = is_command_safe(command)
     if not is_safe:
-        return {
-            "success": False,
-            "error": f"Command blocked for security: {reason}",
-            "stdout": "",
-            "stderr": "",
-            "return_code": -1,
-            "command": command,
-            "working_dir": working_dir or os.getcwd()
-        }
+        return BashResult(
+            success=False,
+            error=f"Command blocked for security: {reason}",
+            command=command,
+            working_dir=working_dir or _DEFAULT_CWD
+        )
     
     # Validate working directory if provided
     if working_dir:
         working_path = Path(working_dir)
         if not working_path.exists():
-            return {
-                "success": False,
-                "error": f"Working directory does not exist: {working_dir}",
-                "stdout": "",
-                "stderr": "",
-                "return_code": -1,
-                "command": command,
-                "working_dir": working_dir
-            }
+            return BashResult(
+                success=False,
+                error=f"Working directory does not exist: {working_dir}",
+                command=command,
+                working_dir=working_dir
+            )
         if not working_path.is_dir():
-            return {
-                "success": False,
-                "error": f"Working directory path is not a directory: {working_dir}",
-                "stdout": "",
-                "stderr": "",
-                "return_code": -1,
-                "command": command,
-                "working_dir": working_dir
-            }
+            return BashResult(
+                success=False,
+                error=f"Working directory path is not a directory: {working_dir}",
+                command=command,
+                working_dir=working_dir
+            )
+    
+    # Split the command into arguments for direct execution
+    argv: list[str] = []
+    if not use_shell:
+        try:
+            argv = shlex.split(command)
+        except ValueError as e:
+            return BashResult(
+                success=False,
+                error=f"Unable to parse command: {e}",
+                command=command,
+                working_dir=working_dir or _DEFAULT_CWD
+            )
+        if not argv:
+            return BashResult(
+                success=False,
+                error="Empty command",
+                command=command,
+                working_dir=working_dir or _DEFAULT_CWD
+            )
+        executable = _resolve_executable(argv[0])
+        if executable is None:
+            return BashResult(
+                success=False,
+                error=f"Command not found: {argv[0]}",
+                command=command,
+                working_dir=working_dir or _DEFAULT_CWD
+            )
+        argv[0] = executable
     
     try:
-        logger.info(f"Executing command: {command}")
+        logger.info("Executing command: %s", command)
         if working_dir:
-            logger.info(f"Working directory: {working_dir}")
+            logger.info("Working directory: %s", working_dir)
+        
+        # Limit environment for security
+        env = _BASE_ENV | {'PWD': working_dir or _DEFAULT_CWD}
         
         # Execute command with timeout
-        process = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=working_dir,
-            # Limit environment for security
-            env={
-                'PATH': os.environ.get('PATH', ''),
-                'HOME': os.environ.get('HOME', ''),
-                'USER': os.environ.get('USER', ''),
-                'PWD': working_dir or os.getcwd()
-            }
-        )
+        if use_shell:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=working_dir,
+                env=env
+            )
+        else:
+            process = await asyncio.create_subprocess_exec(
+                argv[0],
+                *argv[1:],
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=working_dir,
+                env=env
+            )
         
         # Wait for completion with timeout
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(), 
+            stdout, stderr, truncated = await asyncio.wait_for(
+                _collect_output(process),
                 timeout=TIMEOUT_SECONDS
             )
             return_code = process.returncode
+            # _collect_output() waits for the process, so it has exited
+            assert return_code is not None
         except asyncio.TimeoutError:
             # Kill the process if it times out
             process.kill()
             await process.wait()
-            return {
-                "success": False,
-                "error": f"Command timed out after {TIMEOUT_SECONDS} seconds",
-                "stdout": "",
-                "stderr": "",
-                "return_code": -1,
-                "command": command,
-                "working_dir": working_dir or os.getcwd()
-            }
+            return BashResult(
+                success=False,
+                error=f"Command timed out after {TIMEOUT_SECONDS} seconds",
+                command=command,
+                working_dir=working_dir or _DEFAULT_CWD
+            )
         
-        # Decode output
-        stdout_text = stdout.decode('utf-8', errors='replace').strip()
-        stderr_text = stderr.decode('utf-8', errors='replace').strip()
+        # Decode output, skipping empty streams; leading whitespace is kept
+        stdout_text = stdout.decode('utf-8', errors='replace').rstrip() if stdout else ""
+        stderr_text = stderr.decode('utf-8', errors='replace').rstrip() if stderr else ""
         
-        success = return_code == 0
-        result = {
-            "success": success,
-            "stdout": stdout_text,
-            "stderr": stderr_text,
-            "return_code": return_code,
-            "command": command,
-            "working_dir": working_dir or os.getcwd()
-        }
+        result = BashResult(
+            success=return_code == 0,
+            stdout=stdout_text,
+            stderr=stderr_text,
+            return_code=return_code,
+            command=command,
+            working_dir=working_dir or _DEFAULT_CWD,
+            truncated=truncated
+        )
         
-        if not success:
-            result["error"] = f"Command failed with return code {return_code}"
+        if truncated:
+            result.error = f"Output exceeded {MAX_OUTPUT_BYTES} bytes and was truncated"
+        elif not result.success:
+            result.error = f"Command failed with return code {return_code}"
         
-        logger.info(f"Command completed with return code: {return_code}")
+        logger.info("Command completed with return code: %s", return_code)
         return result
         
     except Exception as e:
-        logger.error(f"Error executing command: {e}")
-        return {
-            "success": False,
-            "error": f"Execution error: {str(e)}",
-            "stdout": "",
-            "stderr": "",
-            "return_code": -1,
-            "command": command,
-            "working_dir": working_dir or os.getcwd()
-        }
+        logger.error("Error executing command: %s", e)
+        return BashResult(
+            success=False,
+            error=f"Execution error: {str(e)}",
+            command=command,
+            working_dir=working_dir or _DEFAULT_CWD
+        )
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+class CachedFunction(Protocol, Generic[P, R]):
+    """Async function wrapped by cached_tool."""
+    cache_clear: Callable[[], None]
+    
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> Coroutine[Any, Any, R]: ...
 
-# Create FastMCP server instance
+def cached_tool(
+    ttl: Optional[float] = None,
+    maxsize: int = 128,
+    should_cache: Optional[Callable[[Any], bool]] = None
+) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], CachedFunction[P, R]]:
+    """
+    Cache the results of an async function, keyed on its arguments.
+    
+    Expired entries are purged on every call, and the least-recently-used
+    entry is evicted once more than ``maxsize`` are held. Concurrent misses
+    for the same key may both run the function.
+    
+    Args:
+        ttl: Seconds a result stays valid, or None to keep it until evicted
+        maxsize: Maximum number of cached results
+        should_cache: Optional predicate; results it rejects are not stored
+    """
+    def decorator(fn: Callable[P, Coroutine[Any, Any, R]]) -> CachedFunction[P, R]:
+        cache: OrderedDict[Any, tuple[Optional[float], R]] = OrderedDict()
+        
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            if ttl is not None:
+                expired = [
+                    k for k, (expires_at, _) in cache.items()
+                    if expires_at is not None and expires_at <= now
+                ]
+                for k in expired:
+                    del cache[k]
+            
+            entry = cache.get(key)
+            if entry is not None:
+                cache.move_to_end(key)
+                return entry[1]
+            
+            result = await fn(*args, **kwargs)
+            if should_cache is None or should_cache(result):
+                cache[key] = (None if ttl is None else now + ttl, result)
+                cache.move_to_end(key)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+        
+        cached = cast(CachedFunction[P, R], wrapper)
+        cached.cache_clear = cache.clear
+        return cached
+    return decorator
+
+# Short-lived cache for callers that opt in, e.g. repeated `whoami` or `uname`.
+# Kept small because each result can hold up to 2 * MAX_OUTPUT_BYTES of output.
+# Only successful runs are stored so failures and timeouts are retried.
+_cached_execute_bash_command = cached_tool(
+    ttl=EXECUTION_CACHE_TTL_SECONDS,
+    maxsize=16,
+    should_cache=lambda result: result.success
+)(execute_bash_command)
+
+# Create FastMCP server instance. The @mcp.tool() decorators below build each
+# tool's JSON schemas once, at import, so tools/list serves stored schemas.
 mcp = FastMCP("Bash Command Server")
 
 @mcp.tool()
 async def execute_bash(
     command: str,
-    working_directory: Optional[str] = None
-) -> Dict[str, Any]:
+    working_directory: Optional[str] = None,
+    allow_cache: bool = False
+) -> BashResult:
     """
     Execute a bash command safely with security restrictions.
     
@@ -200,20 +463,29 @@ async def execute_bash(
     - Limited environment variables
     - Working directory validation
     
+    The command is run directly, not through a shell: variables ($HOME), globs
+    (*) and ~ are not expanded, and shell builtins such as cd or export are not
+    available. Quoting follows shell rules for splitting arguments.
+    
     Args:
         command: The bash command to execute (max 1000 characters)
         working_directory: Optional directory to run the command in
+        allow_cache: Reuse the successful result of an identical call made within
+            the last second; only suitable for read-only commands such as `whoami`
         
     Returns:
-        Dict containing:
+        BashResult containing:
         - success: Boolean indicating if command succeeded
         - stdout: Standard output from the command
         - stderr: Standard error from the command  
         - return_code: Exit code of the command
         - command: The executed command
         - working_dir: The directory where command was executed
-        - error: Error message if command failed or was blocked
+        - error: Error message if command failed or was blocked, otherwise null
+        - truncated: True if output exceeded the size limit
     """
+    if allow_cache:
+        return await _cached_execute_bash_command(command, working_directory)
     return await execute_bash_command(command, working_directory)
 
 @mcp.tool()
@@ -224,23 +496,7 @@ async def list_safe_commands() -> List[str]:
     Returns:
         List of safe command examples
     """
-    return [
-        "ls -la",
-        "pwd", 
-        "whoami",
-        "date",
-        "echo 'hello world'",
-        "cat /etc/os-release",
-        "ps aux",
-        "df -h",
-        "free -h",
-        "uptime",
-        "which python",
-        "python --version",
-        "uv --version",
-        "git status",
-        "git log --oneline -5"
-    ]
+    return list(_SAFE_COMMANDS)
 
 @mcp.tool()
 async def get_security_info() -> Dict[str, Any]:
@@ -250,22 +506,8 @@ async def get_security_info() -> Dict[str, Any]:
     Returns:
         Dict containing security configuration details
     """
-    return {
-        "max_command_length": MAX_COMMAND_LENGTH,
-        "timeout_seconds": TIMEOUT_SECONDS,
-        "blocked_commands": sorted(list(BLOCKED_COMMANDS)),
-        "blocked_patterns": BLOCKED_PATTERNS,
-        "environment_variables_available": ["PATH", "HOME", "USER", "PWD"],
-        "security_features": [
-            "Command length validation",
-            "Dangerous command blocking", 
-            "Pattern-based filtering",
-            "Execution timeout",
-            "Limited environment",
-            "Working directory validation",
-            "Safe character validation"
-        ]
-    }
+    # Values are immutable, so a shallow copy keeps callers off the shared dict
+    return dict(_SECURITY_INFO)
 
 if __name__ == "__main__":
     # Run the server with HTTP transport
@@ -279,8 +521,11 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
+    # Configure logging only when run as a script; importers configure their own
+    logging.basicConfig(level=logging.INFO)
+    
     if args.transport == "http":
-        logger.info(f"Starting Bash Command Server on http://{args.host}:{args.port}")
+        logger.info("Starting Bash Command Server on http://%s:%s", args.host, args.port)
         mcp.run(transport="http", port=args.port, host=args.host)
     else:
         logger.info("Starting Bash Command Server with stdio transport")
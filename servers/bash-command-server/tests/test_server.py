@@ -9,8 +9,15 @@ and test its various capabilities.
 import asyncio
 import sys
 import os
+import tempfile
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-from bash_command_server import execute_bash_command
+from bash_command_server import (
+    EXECUTION_CACHE_TTL_SECONDS,
+    MAX_OUTPUT_BYTES,
+    _cached_execute_bash_command,
+    execute_bash_command,
+    is_command_safe,
+)
 
 async def test_safe_commands():
     """Test execution of safe commands."""
@@ -29,14 +36,14 @@ async def test_safe_commands():
         print(f"\nExecuting: {cmd}")
         result = await execute_bash_command(cmd)
         
-        if result["success"]:
-            print(f"✓ Success (exit code: {result['return_code']})")
-            if result["stdout"]:
-                print(f"  Output: {result['stdout']}")
+        if result.success:
+            print(f"✓ Success (exit code: {result.return_code})")
+            if result.stdout:
+                print(f"  Output: {result.stdout}")
         else:
-            print(f"✗ Failed: {result.get('error', 'Unknown error')}")
-            if result["stderr"]:
-                print(f"  Error: {result['stderr']}")
+            print(f"✗ Failed: {result.error or 'Unknown error'}")
+            if result.stderr:
+                print(f"  Error: {result.stderr}")
 
 async def test_blocked_commands():
     """Test that dangerous commands are properly blocked."""
@@ -55,26 +62,93 @@ async def test_blocked_commands():
         print(f"\nTesting blocked command: {cmd}")
         result = await execute_bash_command(cmd)
         
-        if not result["success"]:
-            print(f"✓ Properly blocked: {result.get('error', 'Unknown reason')}")
+        if not result.success:
+            print(f"✓ Properly blocked: {result.error or 'Unknown reason'}")
         else:
             print(f"✗ WARNING: Command was not blocked!")
 
+def test_command_validation():
+    """Test command validation results and reasons."""
+    print("\n\n=== Testing Command Validation ===")
+    
+    # Blocked command names, however the first word is spelled or quoted
+    for cmd in ["RM -rf x", "\\rm x", "'rm' x", '"rm"']:
+        is_safe, reason = is_command_safe(cmd)
+        assert not is_safe, f"{cmd!r} was not blocked"
+        assert reason == "Blocked command: rm", f"{cmd!r}: {reason}"
+    
+    # Input that cannot be tokenized is rejected rather than guessed at
+    is_safe, reason = is_command_safe("'rm -rf x")
+    assert not is_safe and reason.startswith("Unable to parse command"), reason
+    
+    # The most specific blocked pattern is reported
+    is_safe, reason = is_command_safe("a >> b")
+    assert not is_safe and reason == "Blocked pattern detected: >>", reason
+    for cmd in ["echo {a", "echo a}"]:
+        is_safe, reason = is_command_safe(cmd)
+        assert not is_safe and reason.startswith("Blocked pattern detected: "), f"{cmd!r}: {reason}"
+    
+    for cmd in ["ls -la", "echo 'hello world'"]:
+        assert is_command_safe(cmd) == (True, ""), f"{cmd!r} was blocked"
+    
+    print("✓ Validation results match expectations")
+
 async def test_working_directory():
     """Test working directory functionality."""
     print("\n\n=== Testing Working Directory ===")
     
     # Test with current directory
     result1 = await execute_bash_command("pwd")
-    print(f"Current directory: {result1.get('stdout', 'N/A')}")
+    print(f"Current directory: {result1.stdout or 'N/A'}")
     
     # Test with specific directory (if it exists)
     test_dir = "/tmp"
     result2 = await execute_bash_command("pwd", test_dir)
-    if result2["success"]:
-        print(f"Command in {test_dir}: {result2.get('stdout', 'N/A')}")
+    if result2.success:
+        print(f"Command in {test_dir}: {result2.stdout or 'N/A'}")
     else:
-        print(f"Working directory test failed: {result2.get('error', 'N/A')}")
+        print(f"Working directory test failed: {result2.error or 'N/A'}")
+
+async def test_output_limit():
+    """Test that oversized output is truncated and the command is killed."""
+    print("\n\n=== Testing Output Limit ===")
+    
+    result = await execute_bash_command(f"head -c {2 * MAX_OUTPUT_BYTES} /dev/zero")
+    assert result.truncated, "oversized output was not truncated"
+    assert result.return_code == -9, f"expected SIGKILL, got {result.return_code}"
+    assert len(result.stdout) == MAX_OUTPUT_BYTES, len(result.stdout)
+    assert result.error == f"Output exceeded {MAX_OUTPUT_BYTES} bytes and was truncated", result.error
+    
+    result = await execute_bash_command(f"head -c {MAX_OUTPUT_BYTES - 1} /dev/zero")
+    assert result.success and not result.truncated, result.error
+    assert len(result.stdout) == MAX_OUTPUT_BYTES - 1, len(result.stdout)
+    
+    print("✓ Output is capped at MAX_OUTPUT_BYTES")
+
+async def test_execution_cache():
+    """Test the opt-in execution cache used by execute_bash(allow_cache=True)."""
+    print("\n\n=== Testing Execution Cache ===")
+    _cached_execute_bash_command.cache_clear()
+    
+    # `date +%N` prints nanoseconds, so a fresh run gives different output
+    first = await _cached_execute_bash_command("date +%N")
+    second = await _cached_execute_bash_command("date +%N")
+    assert first.success and second is first, "second call inside the TTL was not cached"
+    
+    await asyncio.sleep(EXECUTION_CACHE_TTL_SECONDS + 0.1)
+    third = await _cached_execute_bash_command("date +%N")
+    assert third is not first and third.stdout != first.stdout, "expired result was reused"
+    
+    # Failures are not cached: the same call succeeds once the directory exists
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = os.path.join(tmp, "later")
+        failed = await _cached_execute_bash_command("pwd", work_dir)
+        assert not failed.success
+        os.mkdir(work_dir)
+        retried = await _cached_execute_bash_command("pwd", work_dir)
+        assert retried.success and retried.stdout == work_dir, "failed result was cached"
+    
+    print("✓ Cache hits, expiry and failure handling behave as expected")
 
 async def test_timeout():
     """Test command timeout functionality."""
@@ -82,10 +156,10 @@ async def test_timeout():
     
     # Test a command that should complete quickly
     result = await execute_bash_command("sleep 1 && echo 'completed'")
-    if result["success"]:
+    if result.success:
         print("✓ Short sleep command completed successfully")
     else:
-        print(f"✗ Short sleep failed: {result.get('error', 'Unknown error')}")
+        print(f"✗ Short sleep failed: {result.error or 'Unknown error'}")
     
     print("Note: Long timeout test (sleep 35) skipped to avoid waiting")
 
@@ -97,18 +171,24 @@ async def main():
     try:
         await test_safe_commands()
         await test_blocked_commands() 
+        test_command_validation()
         await test_working_directory()
+        await test_output_limit()
+        await test_execution_cache()
         await test_timeout()
         
         print("\n\n=== Test Summary ===")
         print("✓ Safe command execution tested")
         print("✓ Security blocking tested")
+        print("✓ Command validation tested")
         print("✓ Working directory functionality tested") 
+        print("✓ Output limit tested")
+        print("✓ Execution cache tested")
         print("✓ Timeout functionality tested")
         print("\nServer is ready for use!")
         
     except Exception as e:
-        print(f"\n✗ Test suite failed with error: {e}")
+        print(f"\n✗ Test suite failed with error: {e!r}")
         sys.exit(1)
 
 if __name__ == "__main__":